@@ -0,0 +1,14 @@
+-- config/queries/available_dates.sql
+-- List dates that have a GA4 daily events table, from table metadata only
+-- Parameters: {dataset}, @days_back
+
+SELECT 
+    FORMAT_DATE('%Y-%m-%d', table_date) AS event_date
+FROM (
+    -- events_intraday_* and other tables parse to NULL and drop out below
+    SELECT SAFE.PARSE_DATE('%Y%m%d', SUBSTR(table_name, 8)) AS table_date
+    FROM `{dataset}.INFORMATION_SCHEMA.TABLES`
+    WHERE table_name LIKE 'events_%'
+)
+WHERE table_date >= DATE_SUB(CURRENT_DATE(), INTERVAL @days_back DAY)
+ORDER BY table_date DESC
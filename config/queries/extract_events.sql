@@ -1,6 +1,6 @@
 -- config/queries/extract_events.sql
--- Extract all GA4 events data for a specific date
--- Parameters: {table_name}, {event_date}
+-- Extract all GA4 events data for a specific date or date range
+-- Parameters: {table_name}, {date_filter}, {dedupe_clause}
 
 SELECT 
     -- Event metadata
@@ -95,5 +95,14 @@ SELECT
     publisher
     
 FROM `{table_name}`
-WHERE event_date = '{event_date}'
-ORDER BY event_timestamp
\ No newline at end of file
+WHERE {date_filter}
+{dedupe_clause}
+-- Total order (ties on timestamp are common in batched GA4 events) so the
+-- same day always encodes to the same parquet bytes and content-sha256
+ORDER BY
+    event_date,
+    event_timestamp,
+    user_pseudo_id,
+    event_name,
+    event_bundle_sequence_id,
+    batch_event_index
\ No newline at end of file
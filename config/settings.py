@@ -5,48 +5,72 @@ This is project-specific configuration, not part of the installable package.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict
 from dotenv import load_dotenv
 
+
+@lru_cache(maxsize=None)
+def _load_once() -> Dict[str, str]:
+    """Load the .env file once per process and snapshot the environment"""
+    try:
+        # Generated by scripts/dump_env.py; skips parsing .env on every run
+        from ._env_compiled import ENV
+    except ImportError:
+        load_dotenv()
+    else:
+        for key, value in ENV.items():
+            os.environ.setdefault(key, value)
+    return os.environ.copy()
+
+
 # Load environment variables from .env file
-load_dotenv()
+_env = _load_once()
 
 
 class Settings:
     """Project settings using environment variables"""
     
     # Google Cloud Platform
-    GCP_PROJECT_ID = os.getenv("GCP_PROJECT_ID")
-    GA4_DATASET_ID = os.getenv("GA4_DATASET_ID")
-    GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    GCP_PROJECT_ID = _env.get("GCP_PROJECT_ID")
+    GA4_DATASET_ID = _env.get("GA4_DATASET_ID")
+    GOOGLE_APPLICATION_CREDENTIALS = _env.get("GOOGLE_APPLICATION_CREDENTIALS")
     
     # AWS / LocalStack
     #USE_LOCALSTACK = os.getenv("USE_LOCALSTACK", "false").lower() == "true"
     USE_LOCALSTACK = "true"
-    LOCALSTACK_ENDPOINT = os.getenv("LOCALSTACK_ENDPOINT", "http://localhost:4566")
-    AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
-    AWS_PROFILE = os.getenv("AWS_PROFILE")
-    S3_BUCKET = os.getenv("S3_BUCKET", "bronze-data-bucket")
-    S3_PREFIX = os.getenv("S3_PREFIX", "bronze/ga4")
+    LOCALSTACK_ENDPOINT = _env.get("LOCALSTACK_ENDPOINT", "http://localhost:4566")
+    AWS_REGION = _env.get("AWS_REGION", "us-east-1")
+    AWS_PROFILE = _env.get("AWS_PROFILE")
+    S3_BUCKET = _env.get("S3_BUCKET", "bronze-data-bucket")
+    S3_PREFIX = _env.get("S3_PREFIX", "bronze/ga4")
+    S3_MULTIPART_CHUNKSIZE_MB = int(_env.get("S3_MULTIPART_CHUNKSIZE_MB", "8"))
+    S3_MULTIPART_CONCURRENCY = int(_env.get("S3_MULTIPART_CONCURRENCY", "16"))
     
     # Pipeline
-    BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10000"))
+    BATCH_SIZE = int(_env.get("BATCH_SIZE", "10000"))
+    BACKFILL_WORKERS = int(_env.get("BACKFILL_WORKERS", "8"))
+    
+    # BigQuery export path for large days (optional)
+    GCS_STAGING_URI = _env.get("GCS_STAGING_URI")
+    EXPORT_THRESHOLD_ROWS = int(_env["EXPORT_THRESHOLD_ROWS"]) if _env.get("EXPORT_THRESHOLD_ROWS") else None
     
     # Paths
     PROJECT_ROOT = Path(__file__).parent.parent
     QUERIES_DIR = PROJECT_ROOT / "config" / "queries"
     
+    # Settings that must be present for the pipeline to run
+    REQUIRED = ("GCP_PROJECT_ID", "GA4_DATASET_ID")
+    
     @classmethod
     def validate(cls):
         """Validate required settings"""
-        required = [
-            "GCP_PROJECT_ID",
-            "GA4_DATASET_ID"
-        ]
+        required = cls.REQUIRED
         
         # S3_BUCKET not required when using LocalStack (has default)
         if not cls.USE_LOCALSTACK:
-            required.append("S3_BUCKET")
+            required += ("S3_BUCKET",)
         
         missing = [key for key in required if getattr(cls, key) is None]
         
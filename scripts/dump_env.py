@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compile the .env file into config/_env_compiled.py
+
+Settings imports the compiled module instead of parsing .env on every run.
+Re-run this script after editing .env, or delete the generated file to go
+back to reading .env directly.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+project_root = Path(__file__).parent.parent
+
+OUTPUT_FILE = project_root / "config" / "_env_compiled.py"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile .env into an importable module')
+    parser.add_argument('--env-file', default=str(project_root / ".env"), help='Path to the .env file')
+    
+    args = parser.parse_args()
+    
+    env_file = Path(args.env_file)
+    if not env_file.exists():
+        print(f"❌ .env file not found: {env_file}")
+        return 1
+    
+    # Keys declared without a value come back as None; leave them unset
+    env = {key: value for key, value in dotenv_values(env_file).items() if value is not None}
+    
+    lines = [
+        "# Generated by scripts/dump_env.py - do not edit, re-run the script instead",
+        "ENV = {",
+    ]
+    lines += [f"    {key!r}: {value!r}," for key, value in sorted(env.items())]
+    lines.append("}")
+    
+    # Holds the same credentials as .env; keep it owner-only before writing
+    OUTPUT_FILE.touch(mode=0o600)
+    OUTPUT_FILE.chmod(0o600)
+    OUTPUT_FILE.write_text("\n".join(lines) + "\n")
+    print(f"✅ Compiled {len(env)} variables from {env_file} to {OUTPUT_FILE}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
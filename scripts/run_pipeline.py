@@ -4,6 +4,7 @@ Run the GA4 to Bronze layer pipeline
 """
 
 import sys
+import logging
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -15,13 +16,11 @@ sys.path.insert(0, str(project_root))
 from config import Settings
 from src.pipeline import Pipeline
 
-print(f"DEBUG: USE_LOCALSTACK = {Settings.USE_LOCALSTACK}")
-print(f"DEBUG: S3_BUCKET = {Settings.S3_BUCKET}")
-print(f"DEBUG: LOCALSTACK_ENDPOINT = {Settings.LOCALSTACK_ENDPOINT}")
+logger = logging.getLogger(__name__)
+
 
 def setup_logging():
     """Setup basic logging"""
-    import logging
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -39,11 +38,20 @@ def main():
     parser.add_argument('--test', action='store_true', help='Test connections only')
     parser.add_argument('--status', action='store_true', help='Show pipeline status')
     parser.add_argument('--force', action='store_true', help='Force run even if data exists')
+    parser.add_argument('--workers', type=int, default=Settings.BACKFILL_WORKERS,
+                        help='Dates processed concurrently during backfill')
+    parser.add_argument('--batched', action='store_true',
+                        help='Backfill with one BigQuery query per month instead of per day')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='Drop GA4 events repeated by late-arriving exports')
     
     args = parser.parse_args()
     
     setup_logging()
     
+    logger.debug("USE_LOCALSTACK = %s, S3_BUCKET = %s, LOCALSTACK_ENDPOINT = %s",
+                 Settings.USE_LOCALSTACK, Settings.S3_BUCKET, Settings.LOCALSTACK_ENDPOINT)
+    
     # Validate configuration
     try:
         Settings.validate()
@@ -62,7 +70,12 @@ def main():
         aws_region=Settings.AWS_REGION,
         aws_profile=Settings.AWS_PROFILE,
         use_localstack=Settings.USE_LOCALSTACK,
-        localstack_endpoint=Settings.LOCALSTACK_ENDPOINT
+        localstack_endpoint=Settings.LOCALSTACK_ENDPOINT,
+        dedupe=args.dedupe,
+        multipart_chunksize_mb=Settings.S3_MULTIPART_CHUNKSIZE_MB,
+        multipart_concurrency=Settings.S3_MULTIPART_CONCURRENCY,
+        gcs_staging_uri=Settings.GCS_STAGING_URI,
+        export_threshold_rows=Settings.EXPORT_THRESHOLD_ROWS
     )
     
     # Handle different commands
@@ -95,10 +108,12 @@ def main():
     if args.backfill_start and args.backfill_end:
         print(f"\n🔄 Running backfill from {args.backfill_start} to {args.backfill_end}")
         
-        results = pipeline.backfill(
+        backfill = pipeline.backfill_batched if args.batched else pipeline.backfill
+        results = backfill(
             start_date=args.backfill_start,
             end_date=args.backfill_end,
-            skip_existing=not args.force
+            skip_existing=not args.force,
+            max_workers=args.workers
         )
         
         print(f"\n📋 Backfill Results:")
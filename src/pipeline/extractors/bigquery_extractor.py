@@ -5,15 +5,68 @@ Pulls all events data from GA4 BigQuery export tables.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, Set, Sequence, Tuple
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
 
+from ..utils.rate_limit import TokenBucket
+
+try:
+    from google.cloud.bigquery_storage import BigQueryReadClient
+except ImportError:
+    # Without the BigQuery Storage API results are paged over REST
+    BigQueryReadClient = None
+
+try:
+    from google.cloud import storage
+except ImportError:
+    # Only needed for exporting through GCS
+    storage = None
+
 
 logger = logging.getLogger(__name__)
 
+# SQL query templates (assumes config/queries/ structure)
+QUERIES_DIR = Path(__file__).parent.parent.parent.parent / "config" / "queries"
+
+# Heavily repeated GA4 string columns, stored as pandas categoricals
+LOW_CARDINALITY_COLUMNS = (
+    "event_name",
+    "platform",
+    "traffic_source",
+    "traffic_medium",
+    "device_category",
+    "operating_system",
+    "browser",
+    "language",
+    "continent",
+    "sub_continent",
+    "country",
+    "region",
+)
+
+# Keeps one row per GA4 event; late-arriving exports can repeat events.
+# Events sent in one batch share timestamp and bundle, so the batch_* fields
+# are part of the key; the ORDER BY tiebreak keeps the surviving row stable.
+DEDUPE_CLAUSE = (
+    "QUALIFY ROW_NUMBER() OVER ("
+    "PARTITION BY event_timestamp, event_name, user_pseudo_id, event_bundle_sequence_id, "
+    "batch_event_index, batch_page_id, batch_ordering_id "
+    "ORDER BY event_server_timestamp_offset, event_previous_timestamp, "
+    "FARM_FINGERPRINT(TO_JSON_STRING(event_params))) = 1"
+)
+
+
+@lru_cache(maxsize=None)
+def _read_queries() -> Dict[str, str]:
+    """Read every SQL template in QUERIES_DIR once per process"""
+    return {path.stem: path.read_text() for path in QUERIES_DIR.glob("*.sql")}
+
 
 class BigQueryExtractor:
     """Extract GA4 events data from BigQuery"""
@@ -23,7 +76,10 @@ class BigQueryExtractor:
         project_id: str, 
         dataset_id: str,
         credentials_path: Optional[str] = None,
-        location: str = "US"
+        location: str = "US",
+        categorical_columns: Sequence[str] = LOW_CARDINALITY_COLUMNS,
+        dedupe: bool = False,
+        job_limiter: Optional[TokenBucket] = None
     ):
         """
         Initialize BigQuery extractor
@@ -33,10 +89,16 @@ class BigQueryExtractor:
             dataset_id: GA4 dataset ID (e.g., 'analytics_123456789')
             credentials_path: Path to service account JSON (optional)
             location: BigQuery location
+            categorical_columns: Columns converted to categoricals in extract_events
+            dedupe: Drop duplicate events in the extraction query (opt-in)
+            job_limiter: Token bucket paced before each query job (optional)
         """
         self.project_id = project_id
         self.dataset_id = dataset_id
         self.location = location
+        self.categorical_columns = tuple(categorical_columns)
+        self.dedupe = dedupe
+        self.job_limiter = job_limiter
         
         # Initialize BigQuery client
         if credentials_path:
@@ -46,6 +108,34 @@ class BigQueryExtractor:
         else:
             # Use default credentials (ADC)
             self.client = bigquery.Client(project=project_id)
+        
+        # SQL templates keyed by query name
+        self._queries = _read_queries()
+        self._events_template = self._load_query("extract_events")
+        
+        # Table IDs in the dataset, listed lazily and reused across dates
+        self._available_tables: Optional[Set[str]] = None
+        
+        # GCS client for exports, created on first use
+        self._storage_client = None
+        
+        # Storage API client for streaming Arrow results
+        self.bqstorage_client = (
+            BigQueryReadClient(credentials=self.client._credentials)
+            if BigQueryReadClient else None
+        )
+    
+    def _query(self, query: str, **kwargs) -> bigquery.QueryJob:
+        """Start a query job, waiting on the job limiter first"""
+        if self.job_limiter is not None:
+            self.job_limiter.acquire()
+        return self.client.query(query, location=self.location, **kwargs)
+    
+    def _events_table(self, date: str) -> str:
+        """Full GA4 events table name for a YYYY-MM-DD date"""
+        # GA4 table naming: events_YYYYMMDD
+        table_date = date.replace("-", "")
+        return f"{self.project_id}.{self.dataset_id}.events_{table_date}"
     
     def extract_events(self, date: str) -> pd.DataFrame:
         """
@@ -57,9 +147,7 @@ class BigQueryExtractor:
         Returns:
             DataFrame with all events data
         """
-        # GA4 table naming: events_YYYYMMDD
-        table_date = date.replace("-", "")
-        table_name = f"{self.project_id}.{self.dataset_id}.events_{table_date}"
+        table_name = self._events_table(date)
         
         # Check if table exists
         if not self._table_exists(table_name):
@@ -72,9 +160,14 @@ class BigQueryExtractor:
         
         try:
             # Execute query and return as DataFrame
-            query_job = self.client.query(query, location=self.location)
+            query_job = self._query(query)
             df = query_job.to_dataframe()
             
+            # Low-cardinality strings shrink several-fold as categoricals
+            for column in self.categorical_columns:
+                if column in df.columns:
+                    df[column] = df[column].astype("category")
+            
             logger.info(f"Successfully extracted {len(df)} events for {date}")
             return df
             
@@ -82,25 +175,177 @@ class BigQueryExtractor:
             logger.error(f"Failed to extract data for {date}: {str(e)}")
             raise
     
+    def extract_events_arrow(self, date: str) -> Iterator[pa.RecordBatch]:
+        """
+        Stream all GA4 events for a specific date as Arrow record batches
+        
+        Batches are yielded as they arrive, so consumers can start writing
+        before the full result set has been downloaded.
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            
+        Yields:
+            Record batches of events data (nothing if the table is missing)
+        """
+        table_name = self._events_table(date)
+        
+        if not self._table_exists(table_name):
+            logger.warning(f"Table {table_name} does not exist")
+            return
+        
+        query = self._build_events_query(table_name, date)
+        
+        logger.info(f"Streaming events data for {date} from {table_name}")
+        
+        try:
+            query_job = self._query(query)
+            yield from query_job.result().to_arrow_iterable(
+                bqstorage_client=self.bqstorage_client
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to stream data for {date}: {str(e)}")
+            raise
+    
+    def _list_tables(self) -> Set[str]:
+        """Table IDs in the dataset, listed once and cached"""
+        if self._available_tables is None:
+            tables = self.client.list_tables(f"{self.project_id}.{self.dataset_id}")
+            self._available_tables = {table.table_id for table in tables}
+        return self._available_tables
+    
+    def refresh_tables(self):
+        """Drop the cached table listing so the next lookup re-lists the dataset"""
+        self._available_tables = None
+    
+    def extract_events_range(
+        self, 
+        start_date: str, 
+        end_date: str
+    ) -> Iterator[Tuple[str, pa.RecordBatch]]:
+        """
+        Stream GA4 events for a date range with a single query
+        
+        Rows arrive ordered by event_date, and each batch is split so
+        every yielded piece belongs to exactly one date.
+        
+        Args:
+            start_date: First date in YYYY-MM-DD format, inclusive
+            end_date: Last date in YYYY-MM-DD format, inclusive
+            
+        Yields:
+            (date in YYYY-MM-DD format, record batch) pairs in date order
+        """
+        query = self._build_range_query(start_date, end_date)
+        
+        logger.info(f"Streaming events data for {start_date} to {end_date}")
+        
+        try:
+            query_job = self._query(query)
+            batches = query_job.result().to_arrow_iterable(
+                bqstorage_client=self.bqstorage_client
+            )
+            
+            for batch in batches:
+                event_dates = batch.column("event_date")
+                # Usually a single date; batches can straddle a day boundary
+                for event_date in pc.unique(event_dates).to_pylist():
+                    date = f"{event_date[:4]}-{event_date[4:6]}-{event_date[6:]}"
+                    yield date, batch.filter(pc.equal(event_dates, event_date))
+            
+        except Exception as e:
+            logger.error(f"Failed to stream data for {start_date} to {end_date}: {str(e)}")
+            raise
+    
+    def estimate_row_count(self, date: str) -> int:
+        """
+        Row count of a day's events table from table metadata (no scan)
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            
+        Returns:
+            Number of rows, 0 if the table does not exist
+        """
+        try:
+            return self.client.get_table(self._events_table(date)).num_rows or 0
+        except NotFound:
+            return 0
+    
+    def export_events(self, date: str, gcs_uri: str) -> list:
+        """
+        Export a day of events to GCS as parquet with EXPORT DATA
+        
+        BigQuery writes the files in parallel server-side, so the rows
+        never pass through this process.
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            gcs_uri: GCS staging prefix (e.g., 'gs://bucket/ga4'); files
+                land under {gcs_uri}/{date}/
+            
+        Returns:
+            List of exported storage.Blob objects (empty if the table is missing)
+        """
+        if storage is None:
+            raise ImportError("google-cloud-storage is required to export through GCS")
+        
+        table_name = self._events_table(date)
+        
+        if not self._table_exists(table_name):
+            logger.warning(f"Table {table_name} does not exist")
+            return []
+        
+        bucket_name, _, prefix = gcs_uri[len("gs://"):].partition("/")
+        export_prefix = f"{prefix.strip('/')}/{date}/".lstrip("/")
+        
+        query = (
+            f"EXPORT DATA OPTIONS(uri='gs://{bucket_name}/{export_prefix}*.parquet', "
+            f"format='PARQUET', compression='SNAPPY', overwrite=true) AS\n"
+            f"{self._build_events_query(table_name, date)}"
+        )
+        
+        logger.info(f"Exporting events data for {date} to gs://{bucket_name}/{export_prefix}")
+        
+        try:
+            self._query(query).result()
+            
+        except Exception as e:
+            logger.error(f"Failed to export data for {date}: {str(e)}")
+            raise
+        
+        if self._storage_client is None:
+            self._storage_client = storage.Client(
+                project=self.project_id, credentials=self.client._credentials
+            )
+        
+        return sorted(
+            self._storage_client.list_blobs(bucket_name, prefix=export_prefix),
+            key=lambda blob: blob.name
+        )
+    
     def _table_exists(self, table_name: str) -> bool:
         """Check if BigQuery table exists"""
+        table_id = table_name.rsplit(".", 1)[-1]
+        if table_id in self._list_tables():
+            return True
+        
+        # Tables created after the listing was cached are confirmed directly
         try:
             self.client.get_table(table_name)
-            return True
         except NotFound:
             return False
+        self._list_tables().add(table_id)
+        return True
     
     def _load_query(self, query_name: str) -> str:
-        """Load SQL query from file"""
-        from pathlib import Path
-        
-        # Get query file path (assumes config/queries/ structure)
-        query_file = Path(__file__).parent.parent.parent.parent / "config" / "queries" / f"{query_name}.sql"
-        
-        if not query_file.exists():
-            raise FileNotFoundError(f"Query file not found: {query_file}")
-        
-        return query_file.read_text()
+        """Load SQL query template by name"""
+        try:
+            return self._queries[query_name]
+        except KeyError:
+            query_file = QUERIES_DIR / f"{query_name}.sql"
+            raise FileNotFoundError(f"Query file not found: {query_file}") from None
     
     def _build_events_query(self, table_name: str, date: str) -> str:
         """
@@ -116,13 +361,36 @@ class BigQueryExtractor:
         # Format date for BigQuery (YYYYMMDD)
         event_date = date.replace("-", "")
         
-        # Load query template from file
-        query_template = self._load_query("extract_events")
-        
-        # Format with parameters
-        query = query_template.format(
+        # Format the template loaded at init with parameters
+        query = self._events_template.format(
             table_name=table_name,
-            event_date=event_date
+            date_filter=f"event_date = '{event_date}'",
+            dedupe_clause=DEDUPE_CLAUSE if self.dedupe else ""
+        )
+        
+        return query
+    
+    def _build_range_query(self, start_date: str, end_date: str) -> str:
+        """
+        Build the BigQuery SQL query to extract events for a date range
+        
+        Queries the events_* wildcard table; the _TABLE_SUFFIX filter
+        limits the scan to the daily tables in range.
+        
+        Args:
+            start_date: First date (YYYY-MM-DD), inclusive
+            end_date: Last date (YYYY-MM-DD), inclusive
+            
+        Returns:
+            SQL query string
+        """
+        start_suffix = start_date.replace("-", "")
+        end_suffix = end_date.replace("-", "")
+        
+        query = self._events_template.format(
+            table_name=f"{self.project_id}.{self.dataset_id}.events_*",
+            date_filter=f"_TABLE_SUFFIX BETWEEN '{start_suffix}' AND '{end_suffix}'",
+            dedupe_clause=DEDUPE_CLAUSE if self.dedupe else ""
         )
         
         return query
@@ -131,36 +399,33 @@ class BigQueryExtractor:
         """
         Get list of available dates in the GA4 dataset
         
+        Reads INFORMATION_SCHEMA.TABLES, so only table metadata is scanned.
+        
         Args:
             days_back: Number of days to look back
             
         Returns:
-            List of available dates in YYYY-MM-DD format
-        """
-        # Get table list from dataset
-        tables = self.client.list_tables(f"{self.project_id}.{self.dataset_id}")
-        
-        # Filter for events tables and extract dates
-        available_dates = []
-        today = datetime.now().date()
-        
-        for table in tables:
-            if table.table_id.startswith("events_"):
-                try:
-                    # Extract date from table name (events_YYYYMMDD)
-                    date_str = table.table_id.split("_")[1]
-                    date_obj = datetime.strptime(date_str, "%Y%m%d").date()
-                    
-                    # Only include recent dates
-                    if (today - date_obj).days <= days_back:
-                        formatted_date = date_obj.strftime("%Y-%m-%d")
-                        available_dates.append(formatted_date)
-                        
-                except (ValueError, IndexError):
-                    # Skip invalid table names
-                    continue
-        
-        return sorted(available_dates, reverse=True)
+            List of available dates in YYYY-MM-DD format, newest first
+        """
+        query = self._load_query("available_dates").format(
+            dataset=f"{self.project_id}.{self.dataset_id}"
+        )
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("days_back", "INT64", days_back)]
+        )
+        
+        rows = self._query(query, job_config=job_config).result()
+        return [row.event_date for row in rows]
+    
+    def close(self):
+        """Release the BigQuery, Storage API and GCS client connections"""
+        self.client.close()
+        
+        if self.bqstorage_client is not None:
+            self.bqstorage_client.transport.close()
+        
+        if self._storage_client is not None:
+            self._storage_client.close()
     
     def test_connection(self) -> bool:
         """Test BigQuery connection and dataset access"""
@@ -4,18 +4,110 @@ S3 loader for bronze layer data.
 Saves GA4 events data to S3 in parquet format with date partitioning.
 """
 
+import hashlib
+import io
 import logging
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, FrozenSet, Set, Union, Sequence, Callable, BinaryIO
 import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from ..utils.rate_limit import TokenBucket
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 logger = logging.getLogger(__name__)
 
+# Large parquet files go up as concurrent multipart uploads
+MULTIPART_CHUNKSIZE_MB = 8
+MULTIPART_CONCURRENCY = 16
+
+# Parquet encoding for bronze files; ZSTD roughly halves GA4 string columns vs snappy
+PARQUET_COMPRESSION = 'zstd'
+ZSTD_COMPRESSION_LEVEL = 3
+PARQUET_WRITE_OPTIONS = {
+    'use_dictionary': True,
+    'data_page_size': 1 << 20,
+    'write_statistics': True
+}
+ROW_GROUP_SIZE = 256_000
+
+# Date partition of a data file key, e.g. .../year=2024/month=01/day=15/data.parquet
+_PART_RE = re.compile(r"year=(\d{4})/month=(\d{2})/day=(\d{2})/[^/]+\.parquet$")
+
+# Concurrent LIST requests when scanning partitions
+LIST_CONCURRENCY = 16
+
+# Hash buckets are two hex characters, e.g. .../bucket=a7/events/.... The
+# bucket space is fixed so a date's key never depends on configuration.
+HASH_PARTITIONS = 256
+
+
+def _file_sha256(fileobj: BinaryIO) -> str:
+    """Hex SHA-256 of a seekable file's contents, leaving it rewound"""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(1 << 20), b''):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _dumps(obj: Dict[str, Any]) -> bytes:
+    """Serialize metadata to compact JSON with sorted keys"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode()
+
+
+@lru_cache(maxsize=8)
+def _get_s3_client(
+    region: str,
+    aws_profile: Optional[str] = None,
+    localstack_endpoint: Optional[str] = None,
+    max_pool_connections: int = 10
+):
+    """
+    Create an S3 client once per region/profile/endpoint/pool size
+    
+    Credential resolution and endpoint loading are paid on the first call
+    only; botocore clients are thread-safe so the result can be shared.
+    """
+    config = Config(
+        max_pool_connections=max_pool_connections,
+        retries={'max_attempts': 10, 'mode': 'adaptive'}
+    )
+    
+    if localstack_endpoint:
+        return boto3.client(
+            's3', 
+            region_name=region, 
+            endpoint_url=localstack_endpoint,
+            aws_access_key_id='test',
+            aws_secret_access_key='test',
+            config=config
+        )
+    
+    session = boto3.Session(profile_name=aws_profile) if aws_profile else boto3.Session()
+    return session.client('s3', region_name=region, config=config)
+
 
 class S3Loader:
     """Load data to S3 bronze layer with date partitioning"""
@@ -27,7 +119,14 @@ class S3Loader:
         region: str = "us-east-1",
         aws_profile: Optional[str] = None,
         use_localstack: bool = False,
-        localstack_endpoint: str = "http://localhost:4566"
+        localstack_endpoint: str = "http://localhost:4566",
+        exists_cache_ttl: float = 300,
+        max_pool_connections: int = 10,
+        multipart_chunksize_mb: int = MULTIPART_CHUNKSIZE_MB,
+        multipart_concurrency: int = MULTIPART_CONCURRENCY,
+        compression: str = PARQUET_COMPRESSION,
+        put_limiter: Optional[TokenBucket] = None,
+        hash_partitions: int = 0
     ):
         """
         Initialize S3 loader
@@ -37,106 +136,452 @@ class S3Loader:
             prefix: S3 key prefix (e.g., 'bronze/ga4')
             region: AWS region
             aws_profile: AWS profile name (optional)
+            exists_cache_ttl: Seconds a partition listing answers check_exists
+            max_pool_connections: HTTP connections kept open to S3; size for
+                concurrent uploads (each multipart upload uses several)
+            multipart_chunksize_mb: Part size (and multipart threshold) in MiB
+            multipart_concurrency: Parts uploaded in parallel per file
+            compression: Parquet codec (e.g., 'zstd', 'snappy', 'gzip')
+            put_limiter: Token bucket paced per PUT request (optional)
+            hash_partitions: 256 spreads dates over hash-named key prefixes
+                (bucket=00 ... bucket=ff) to raise the S3 request ceiling;
+                0 keeps the flat layout. Choose once per prefix: data written
+                under the other layout is not found by check_exists
         """
-        print(f"DEBUG S3Loader: use_localstack = {use_localstack}")
-        print(f"DEBUG S3Loader: localstack_endpoint = {localstack_endpoint}")
+        logger.debug("S3Loader: use_localstack = %s, localstack_endpoint = %s",
+                     use_localstack, localstack_endpoint)
         self.bucket_name = bucket_name
         self.prefix = prefix.rstrip('/')  # Remove trailing slash
         self.region = region
         self.use_localstack = use_localstack
+        self.exists_cache_ttl = exists_cache_ttl
+        self.compression = compression
+        self.parquet_options = dict(PARQUET_WRITE_OPTIONS, compression=compression)
+        if compression == 'zstd':
+            self.parquet_options['compression_level'] = ZSTD_COMPRESSION_LEVEL
+        
+        self.put_limiter = put_limiter
+        
+        if hash_partitions not in (0, HASH_PARTITIONS):
+            raise ValueError(f"hash_partitions must be 0 (flat layout) or {HASH_PARTITIONS}")
+        self.hash_partitions = hash_partitions
+        self.multipart_chunksize = multipart_chunksize_mb * 1024 * 1024
+        
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_chunksize_mb * 1024 * 1024,
+            multipart_chunksize=multipart_chunksize_mb * 1024 * 1024,
+            max_concurrency=multipart_concurrency,
+            use_threads=True
+        )
+        
+        # Bucket access and partition listings don't change mid-run
+        self._connection_ok: Optional[bool] = None
+        self._existing_dates: Dict[str, FrozenSet[str]] = {}
+        self._existing_dates_ts: Dict[str, float] = {}
+        self._lock = threading.Lock()
 
-        # Initialize S3 client
+        # Initialize S3 client (shared across loaders with the same settings)
         if use_localstack:
-            self.s3_client = boto3.client(
-                's3', 
-                region_name=region, 
-                endpoint_url=localstack_endpoint,
-                aws_access_key_id='test',
-                aws_secret_access_key='test'
+            self.s3_client = _get_s3_client(
+                region, localstack_endpoint=localstack_endpoint, max_pool_connections=max_pool_connections
             )
             logger.info(f"Using LocalStack S3 at {localstack_endpoint}")
         else:
-            session = boto3.Session(profile_name=aws_profile) if aws_profile else boto3.Session()
-            self.s3_client = session.client('s3', region_name=region)
+            self.s3_client = _get_s3_client(
+                region, aws_profile=aws_profile, max_pool_connections=max_pool_connections
+            )
             logger.info(f"Using AWS S3 in region {region} with bucket {bucket_name}")
     
+    def _pace_puts(self, file_size_bytes: int = 0):
+        """Wait on the PUT limiter for one request per multipart part"""
+        if self.put_limiter is not None:
+            self.put_limiter.acquire(max(1, -(-file_size_bytes // self.multipart_chunksize)))
+    
+    def _partition_dir(self, date: str, data_type: str) -> str:
+        """Date-partitioned S3 key prefix for a day's files"""
+        year, month, day = date.split('-')
+        
+        if self.hash_partitions:
+            # Stable across processes, unlike hash(); not a security use (FIPS hosts)
+            bucket = hashlib.md5(date.encode(), usedforsecurity=False).digest()[0]
+            return f"{self.prefix}/bucket={bucket:02x}/{data_type}/year={year}/month={month}/day={day}"
+        
+        return f"{self.prefix}/{data_type}/year={year}/month={month}/day={day}"
+    
+    def _partition_key(self, date: str, data_type: str) -> str:
+        """Date-partitioned S3 key for a data file"""
+        return f"{self._partition_dir(date, data_type)}/data.parquet"
+    
     def upload_events(
         self, 
-        df: pd.DataFrame, 
+        df: Union[pd.DataFrame, pa.Table], 
         date: str,
-        data_type: str = "events"
-    ) -> str:
+        data_type: str = "events",
+        return_result: bool = False
+    ) -> Union[Optional[str], Dict[str, Any]]:
         """
-        Upload events DataFrame to S3 with date partitioning
+        Upload events data to S3 with date partitioning
         
         Args:
-            df: DataFrame containing events data
+            df: DataFrame or Arrow table containing events data
             date: Date string in YYYY-MM-DD format
             data_type: Type of data (e.g., 'events', 'transactions')
+            return_result: Return the same result dictionary as
+                upload_batches instead of just the key
             
         Returns:
-            S3 key where data was uploaded
+            S3 key where data was uploaded (None if no rows), or the result
+            dictionary when return_result is set
         """
-        if df.empty:
-            logger.warning(f"Empty DataFrame provided for {date}")
-            return None
+        # Everything below works off the Arrow table and its schema
+        table = pa.Table.from_pandas(df, preserve_index=False) if isinstance(df, pd.DataFrame) else df
+        num_rows = table.num_rows
+        
+        result = {
+            's3_key': None,
+            'record_count': num_rows,
+            'unchanged': False
+        }
+        
+        if num_rows == 0:
+            logger.warning(f"Empty data provided for {date}")
+            return result if return_result else None
         
         # Create partitioned S3 key
-        year, month, day = date.split('-')
-        s3_key = f"{self.prefix}/{data_type}/year={year}/month={month}/day={day}/data.parquet"
+        s3_key = self._partition_key(date, data_type)
+        result['s3_key'] = s3_key
         
         try:
-            # Convert DataFrame to parquet bytes
-            parquet_buffer = df.to_parquet(index=False, engine='pyarrow')
-            
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=parquet_buffer,
-                ContentType='application/octet-stream'
+            # Write parquet into a buffer the uploader reads from directly
+            parquet_buffer = io.BytesIO()
+            pq.write_table(
+                table, parquet_buffer, row_group_size=ROW_GROUP_SIZE, **self.parquet_options
             )
+            file_size_bytes = parquet_buffer.tell()
+            
+            # Upload to S3 (multipart for large files) unless identical bytes are there
+            if not self._upload_parquet(parquet_buffer, s3_key, date, data_type):
+                result['unchanged'] = True
+                return result if return_result else s3_key
             
-            logger.info(f"Uploaded {len(df)} records to s3://{self.bucket_name}/{s3_key}")
+            logger.info(f"Uploaded {num_rows} records to s3://{self.bucket_name}/{s3_key}")
+            
+            self._mark_exists(date, data_type)
             
             # Upload metadata
-            self._upload_metadata(df, date, data_type, s3_key, len(parquet_buffer))
+            self._upload_metadata(
+                date, data_type, s3_key, file_size_bytes,
+                record_count=num_rows,
+                dtypes={field.name: str(field.type) for field in table.schema}
+            )
             
-            return s3_key
+            return result if return_result else s3_key
             
         except Exception as e:
             logger.error(f"Failed to upload to S3: {str(e)}")
             raise
     
+    def upload_batches(
+        self,
+        batches: Iterable[pa.RecordBatch],
+        date: str,
+        data_type: str = "events"
+    ) -> Dict[str, Any]:
+        """
+        Stream Arrow record batches to S3 as a single parquet file
+        
+        Batches are written to a temporary file as they arrive, so memory
+        use is bounded by one batch rather than the whole day.
+        
+        Args:
+            batches: Iterable of record batches sharing one schema
+            date: Date string in YYYY-MM-DD format
+            data_type: Type of data (e.g., 'events', 'transactions')
+            
+        Returns:
+            Dictionary with the S3 key (None if no rows), record count and
+            whether the upload was skipped because S3 already had the same bytes
+        """
+        s3_key = self._partition_key(date, data_type)
+        result = {
+            's3_key': None,
+            'record_count': 0,
+            'unchanged': False
+        }
+        
+        writer = None
+        try:
+            with tempfile.TemporaryFile() as parquet_file:
+                try:
+                    # Buffer small batches so each row group is ROW_GROUP_SIZE rows
+                    pending, pending_rows = [], 0
+                    for batch in batches:
+                        if writer is None:
+                            writer = pq.ParquetWriter(parquet_file, batch.schema, **self.parquet_options)
+                        pending.append(batch)
+                        pending_rows += batch.num_rows
+                        result['record_count'] += batch.num_rows
+                        
+                        if pending_rows >= ROW_GROUP_SIZE:
+                            # Write whole row groups only; the remainder starts the next one
+                            buffered = pa.Table.from_batches(pending)
+                            full_rows = pending_rows - pending_rows % ROW_GROUP_SIZE
+                            writer.write_table(buffered.slice(0, full_rows), row_group_size=ROW_GROUP_SIZE)
+                            remainder = buffered.slice(full_rows)
+                            pending, pending_rows = remainder.to_batches(), remainder.num_rows
+                    
+                    if pending_rows:
+                        writer.write_table(pa.Table.from_batches(pending), row_group_size=ROW_GROUP_SIZE)
+                finally:
+                    if writer is not None:
+                        writer.close()
+                
+                if result['record_count'] == 0:
+                    logger.warning(f"No records provided for {date}")
+                    return result
+                
+                file_size_bytes = parquet_file.tell()
+                
+                if not self._upload_parquet(parquet_file, s3_key, date, data_type):
+                    result['s3_key'] = s3_key
+                    result['unchanged'] = True
+                    return result
+            
+            logger.info(f"Uploaded {result['record_count']} records to s3://{self.bucket_name}/{s3_key}")
+            self._mark_exists(date, data_type)
+            
+            self._upload_metadata(
+                date, data_type, s3_key, file_size_bytes,
+                record_count=result['record_count'],
+                dtypes={field.name: str(field.type) for field in writer.schema}
+            )
+            
+            result['s3_key'] = s3_key
+            return result
+            
+        except Exception as e:
+            logger.error(f"Failed to upload to S3: {str(e)}")
+            raise
+    
+    def head_object(self, date: str, data_type: str = "events") -> Optional[Dict[str, Any]]:
+        """
+        Fetch the S3 object metadata for a date's data file
+        
+        Args:
+            date: Date string in YYYY-MM-DD format
+            data_type: Type of data (e.g., 'events', 'transactions')
+            
+        Returns:
+            head_object response (including user Metadata), or None if absent
+        """
+        try:
+            return self.s3_client.head_object(
+                Bucket=self.bucket_name, Key=self._partition_key(date, data_type)
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+    
+    def _upload_parquet(self, parquet_file: BinaryIO, s3_key: str, date: str, data_type: str) -> bool:
+        """
+        Upload a parquet file tagged with its content-sha256
+        
+        When the object already in S3 carries the same digest the upload is
+        skipped. Either way other parquet files left in the partition (e.g.
+        by an earlier export) are removed. A fresh partition listing that
+        doesn't include the date saves the HEAD and LIST requests.
+        
+        Returns:
+            True if the file was uploaded, False if S3 already had it
+        """
+        content_sha256 = _file_sha256(parquet_file)
+        may_exist = self._may_exist(date, data_type)
+        
+        if may_exist:
+            head = self.head_object(date, data_type)
+            if head is not None and head.get('Metadata', {}).get('content-sha256') == content_sha256:
+                logger.info(f"s3://{self.bucket_name}/{s3_key} is unchanged, skipping upload")
+                self._remove_stale_files(date, data_type, {s3_key})
+                return False
+        
+        parquet_file.seek(0, io.SEEK_END)
+        self._pace_puts(parquet_file.tell())
+        parquet_file.seek(0)
+        
+        self.s3_client.upload_fileobj(
+            parquet_file,
+            self.bucket_name,
+            s3_key,
+            ExtraArgs={
+                'ContentType': 'application/octet-stream',
+                'Metadata': {'content-sha256': content_sha256}
+            },
+            Config=self.transfer_config
+        )
+        
+        if may_exist:
+            self._remove_stale_files(date, data_type, {s3_key})
+        return True
+    
+    def _may_exist(self, date: str, data_type: str) -> bool:
+        """False only when a fresh cached partition listing shows no data for the date"""
+        with self._lock:
+            existing_dates = self._existing_dates.get(data_type)
+            listed_at = self._existing_dates_ts.get(data_type, 0.0)
+        
+        # Another run may have written the date since an expired listing
+        if existing_dates is None or time.monotonic() - listed_at > self.exists_cache_ttl:
+            return True
+        return date in existing_dates
+    
+    def _remove_stale_files(self, date: str, data_type: str, keep: Set[str]):
+        """
+        Delete parquet files in a date partition that aren't in keep
+        
+        A day written by one path (single data.parquet) and later by the
+        other (data-NNNNN.parquet export files), or re-exported into fewer
+        files, would otherwise be read twice by partition-aware readers.
+        """
+        partition_dir = self._partition_dir(date, data_type)
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        
+        stale = [
+            {'Key': obj['Key']}
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{partition_dir}/")
+            for obj in page.get('Contents', [])
+            if obj['Key'].endswith('.parquet') and obj['Key'] not in keep
+        ]
+        
+        # delete_objects takes at most 1000 keys per request
+        for start in range(0, len(stale), 1000):
+            self._pace_puts()
+            self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={'Objects': stale[start:start + 1000], 'Quiet': True}
+            )
+        
+        if stale:
+            logger.info(f"Removed {len(stale)} stale files from s3://{self.bucket_name}/{partition_dir}/")
+    
+    def copy_parquet_files(
+        self,
+        sources: Sequence[Callable[[], BinaryIO]],
+        date: str,
+        data_type: str = "events",
+        compression: str = "snappy",
+        max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Copy already-encoded parquet files into a date partition
+        
+        Used for files produced elsewhere (e.g. a BigQuery export to GCS).
+        Each source is opened, its row count read from the parquet footer,
+        and the stream uploaded as data-NNNNN.parquet.
+        
+        Args:
+            sources: Callables returning a seekable binary stream per file
+            date: Date string in YYYY-MM-DD format
+            data_type: Type of data (e.g., 'events', 'transactions')
+            compression: Codec the source files were written with
+            max_workers: Number of files copied concurrently
+            
+        Returns:
+            Dictionary with the partition prefix, file keys and record count
+        """
+        partition_dir = self._partition_dir(date, data_type)
+        may_exist = self._may_exist(date, data_type)
+        
+        def copy_file(index: int, open_source: Callable[[], BinaryIO]) -> Dict[str, Any]:
+            s3_key = f"{partition_dir}/data-{index:05d}.parquet"
+            with open_source() as source:
+                parquet_file = pq.ParquetFile(source)
+                copied = {
+                    's3_key': s3_key,
+                    'record_count': parquet_file.metadata.num_rows,
+                    'schema': parquet_file.schema_arrow
+                }
+                
+                source.seek(0, io.SEEK_END)
+                copied['file_size_bytes'] = source.tell()
+                source.seek(0)
+                
+                self._pace_puts(copied['file_size_bytes'])
+                self.s3_client.upload_fileobj(
+                    source,
+                    self.bucket_name,
+                    s3_key,
+                    ExtraArgs={'ContentType': 'application/octet-stream'},
+                    Config=self.transfer_config
+                )
+            return copied
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))) as executor:
+                copied = list(executor.map(copy_file, range(len(sources)), sources))
+            
+        except Exception as e:
+            logger.error(f"Failed to copy files to S3: {str(e)}")
+            raise
+        
+        result = {
+            's3_key': f"{partition_dir}/",
+            's3_keys': [file['s3_key'] for file in copied],
+            'record_count': sum(file['record_count'] for file in copied)
+        }
+        
+        logger.info(f"Copied {len(copied)} files ({result['record_count']} records) "
+                    f"to s3://{self.bucket_name}/{partition_dir}/")
+        
+        if copied:
+            if may_exist:
+                self._remove_stale_files(date, data_type, set(result['s3_keys']))
+            
+            self._mark_exists(date, data_type)
+            self._upload_metadata(
+                date, data_type, result['s3_key'],
+                sum(file['file_size_bytes'] for file in copied),
+                record_count=result['record_count'],
+                dtypes={field.name: str(field.type) for field in copied[0]['schema']},
+                compression=compression
+            )
+        
+        return result
+    
     def _upload_metadata(
         self, 
-        df: pd.DataFrame, 
         date: str, 
         data_type: str, 
         s3_key: str,
-        file_size_bytes: int
+        file_size_bytes: int,
+        record_count: int,
+        dtypes: Dict[str, str],
+        compression: Optional[str] = None
     ):
         """Upload metadata file alongside the data"""
         
         metadata = {
             'date': date,
             'data_type': data_type,
-            'record_count': len(df),
-            'columns': list(df.columns),
+            'record_count': record_count,
+            'columns': list(dtypes),
             'file_size_mb': round(file_size_bytes / (1024 * 1024), 2),
             'upload_timestamp': datetime.now().isoformat(),
             's3_key': s3_key,
-            'dtypes': df.dtypes.astype(str).to_dict()
+            'compression': compression or self.compression,
+            'hash_partitions': self.hash_partitions,
+            'dtypes': dtypes
         }
         
-        # Create metadata S3 key (same path, different filename)
-        metadata_key = s3_key.replace('/data.parquet', '/metadata.json')
+        # Create metadata S3 key (same partition, different filename)
+        metadata_key = f"{s3_key.rsplit('/', 1)[0]}/metadata.json"
         
         try:
+            self._pace_puts()
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=metadata_key,
-                Body=json.dumps(metadata, indent=2),
+                Body=_dumps(metadata),
                 ContentType='application/json'
             )
             logger.info(f"Uploaded metadata to s3://{self.bucket_name}/{metadata_key}")
@@ -148,6 +593,9 @@ class S3Loader:
         """
         Check if data already exists for a given date
         
+        Answered from the cached partition listing; the bucket is only
+        listed again once the listing is older than exists_cache_ttl.
+        
         Args:
             date: Date string in YYYY-MM-DD format
             data_type: Type of data to check
@@ -155,18 +603,83 @@ class S3Loader:
         Returns:
             True if data exists, False otherwise
         """
-        year, month, day = date.split('-')
-        s3_key = f"{self.prefix}/{data_type}/year={year}/month={month}/day={day}/data.parquet"
+        with self._lock:
+            existing_dates = self._existing_dates.get(data_type)
+            listed_at = self._existing_dates_ts.get(data_type, 0.0)
         
-        try:
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
-            return True
-        except ClientError as e:
-            if e.response['Error']['Code'] == '404':
-                return False
-            else:
-                logger.error(f"Error checking S3 object: {str(e)}")
-                raise
+        if existing_dates is None or time.monotonic() - listed_at > self.exists_cache_ttl:
+            existing_dates = self.list_existing_dates(data_type)
+        
+        return date in existing_dates
+    
+    def _mark_exists(self, date: str, data_type: str):
+        """Record a freshly uploaded date in the cached listing"""
+        with self._lock:
+            if data_type in self._existing_dates:
+                self._existing_dates[data_type] = self._existing_dates[data_type] | {date}
+    
+    def _list_dates_under(self, prefix: str) -> Set[str]:
+        """Dates of all data files under an S3 prefix, following pagination"""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        
+        dates = set()
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                match = _PART_RE.search(obj['Key'])
+                if match:
+                    dates.add("-".join(match.groups()))
+        
+        return dates
+    
+    def list_existing_dates(self, data_type: str = "events") -> FrozenSet[str]:
+        """
+        List every date that has data in S3
+        
+        Top-level partitions (e.g. year=2024/) are discovered with one
+        delimited listing, then each is scanned concurrently. With hash
+        partitions every bucket prefix is scanned concurrently instead.
+        
+        Args:
+            data_type: Type of data to list
+            
+        Returns:
+            Set of dates in YYYY-MM-DD format
+        """
+        if self.hash_partitions:
+            partition_prefixes = [
+                f"{self.prefix}/bucket={bucket:02x}/{data_type}/"
+                for bucket in range(HASH_PARTITIONS)
+            ]
+            
+            flat = self.s3_client.list_objects_v2(
+                Bucket=self.bucket_name, Prefix=f"{self.prefix}/{data_type}/", MaxKeys=1
+            )
+            if flat.get('KeyCount'):
+                logger.warning(f"Flat-layout data under s3://{self.bucket_name}/{self.prefix}/{data_type}/ "
+                               f"is ignored with hash partitions enabled")
+        else:
+            prefix = f"{self.prefix}/{data_type}/"
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            
+            partition_prefixes = [
+                common_prefix['Prefix']
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix, Delimiter='/')
+                for common_prefix in page.get('CommonPrefixes', [])
+            ]
+        
+        dates = set()
+        if partition_prefixes:
+            max_workers = min(LIST_CONCURRENCY, len(partition_prefixes))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for partition_dates in executor.map(self._list_dates_under, partition_prefixes):
+                    dates |= partition_dates
+        
+        existing_dates = frozenset(dates)
+        with self._lock:
+            self._existing_dates[data_type] = existing_dates
+            self._existing_dates_ts[data_type] = time.monotonic()
+        
+        return existing_dates
     
     def list_available_dates(self, data_type: str = "events", limit: int = 100) -> list:
         """
@@ -179,36 +692,8 @@ class S3Loader:
         Returns:
             List of dates in YYYY-MM-DD format
         """
-        prefix = f"{self.prefix}/{data_type}/"
-        
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix,
-                Delimiter='/'
-            )
-            
-            dates = []
-            if 'CommonPrefixes' in response:
-                for obj in response['CommonPrefixes']:
-                    # Extract date from S3 path structure
-                    # Expected: bronze/ga4/events/year=2024/month=01/day=15/
-                    path_parts = obj['Prefix'].rstrip('/').split('/')
-                    try:
-                        year_part = [p for p in path_parts if p.startswith('year=')][0]
-                        month_part = [p for p in path_parts if p.startswith('month=')][0]  
-                        day_part = [p for p in path_parts if p.startswith('day=')][0]
-                        
-                        year = year_part.split('=')[1]
-                        month = month_part.split('=')[1]
-                        day = day_part.split('=')[1]
-                        
-                        date_str = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                        dates.append(date_str)
-                        
-                    except (IndexError, ValueError):
-                        continue
-            
+            dates = self.list_existing_dates(data_type)
             return sorted(dates, reverse=True)[:limit]
             
         except Exception as e:
@@ -217,6 +702,9 @@ class S3Loader:
     
     def test_connection(self) -> bool:
         """Test S3 connection and bucket access"""
+        if self._connection_ok:
+            return True
+        
         try:
             # For LocalStack, create bucket if it doesn't exist
             if self.use_localstack:
@@ -233,6 +721,7 @@ class S3Loader:
                 self.s3_client.head_bucket(Bucket=self.bucket_name)
             
             logger.info(f"Successfully connected to S3 bucket: {self.bucket_name}")
+            self._connection_ok = True
             return True
             
         except ClientError as e:
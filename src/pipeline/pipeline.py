@@ -3,16 +3,31 @@
 Main pipeline orchestrator for GA4 to Bronze layer processing.
 """
 
+import asyncio
+import functools
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+import pandas as pd
 
 from .extractors import BigQueryExtractor
 from .loaders import S3Loader
+from .loaders.s3_loader import MULTIPART_CHUNKSIZE_MB, MULTIPART_CONCURRENCY, PARQUET_COMPRESSION
+from .utils.rate_limit import TokenBucket
+from .utils.retry import retry_call, throttled_by
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent backfill days; more tends to trigger S3 503 SlowDown
+MAX_BACKFILL_WORKERS = 16
+
+# Supported query granularities for backfill_batched
+BACKFILL_GROUPS = ("month", "day")
+
 
 class Pipeline:
     """GA4 to Bronze layer data pipeline"""
@@ -31,11 +46,42 @@ class Pipeline:
         # BigQuery settings
 
         gcp_credentials_path: Optional[str] = None,
+        dedupe: bool = False,
         
 
         # LocalStack settings
         use_localstack: bool = False,
-        localstack_endpoint: str = "http://localhost:4566"
+        localstack_endpoint: str = "http://localhost:4566",
+        
+        # How long S3 partition listings answer existence checks
+        exists_cache_ttl: float = 300,
+        
+        # S3 connection pool, shared by concurrent backfill workers
+        s3_max_pool_connections: int = 64,
+        
+        # S3 multipart upload tuning
+        multipart_chunksize_mb: int = MULTIPART_CHUNKSIZE_MB,
+        multipart_concurrency: int = MULTIPART_CONCURRENCY,
+        
+        # Parquet codec for bronze files
+        compression: str = PARQUET_COMPRESSION,
+        
+        # Export settings
+        gcs_staging_uri: Optional[str] = None,
+        export_threshold_rows: Optional[int] = None,
+        
+        # Materialize each day as a DataFrame instead of streaming
+        legacy: bool = False,
+        
+        # Attempts per day for transient BigQuery/S3 failures
+        retry_attempts: int = 5,
+        
+        # Request pacing, halved while the backend is throttling
+        bq_rate: float = 10,
+        s3_rate: float = 1000,
+        
+        # Hash-prefixed S3 layout for heavy parallel backfills
+        hash_partitions: int = 0
     ):
         """
         Initialize the pipeline
@@ -44,18 +90,45 @@ class Pipeline:
             gcp_project_id: Google Cloud project ID
             ga4_dataset_id: GA4 dataset ID in BigQuery
             gcp_credentials_path: Path to GCP service account JSON
+            dedupe: Drop duplicate GA4 events at extraction time (off by
+                default so output matches the raw export)
             s3_bucket: S3 bucket for bronze layer
             s3_prefix: S3 key prefix
             aws_region: AWS region
             aws_profile: AWS profile name
+            exists_cache_ttl: Seconds an S3 partition listing is reused for
+                skip_existing checks before the bucket is listed again
+            s3_max_pool_connections: HTTP connections kept open to S3
+            multipart_chunksize_mb: S3 multipart part size in MiB
+            multipart_concurrency: S3 parts uploaded in parallel per file
+            compression: Parquet codec for files written by the pipeline
+            gcs_staging_uri: GCS prefix for BigQuery exports (e.g., 'gs://bucket/ga4')
+            export_threshold_rows: Days with at least this many rows are
+                exported through GCS instead of streamed (None disables)
+            legacy: Extract each day into a pandas DataFrame before upload
+                instead of streaming Arrow batches
+            retry_attempts: Attempts per day, with exponential backoff, when
+                BigQuery or S3 fail transiently (1 disables retries)
+            bq_rate: BigQuery query jobs started per second
+            s3_rate: S3 PUT requests (including multipart parts) per second
+            hash_partitions: 256 spreads dates over hash-named S3 key
+                prefixes; 0 keeps the flat bronze/ga4/events/... layout.
+                Must not change for an existing prefix
         """
         self.use_localstack = use_localstack
         self.localstack_endpoint = localstack_endpoint
+        
+        # Shared by every worker so concurrency can't outrun backend limits
+        self.bq_limiter = TokenBucket(bq_rate, name="BigQuery")
+        self.s3_limiter = TokenBucket(s3_rate, name="S3")
+        
         # Initialize extractor
         self.extractor = BigQueryExtractor(
             project_id=gcp_project_id,
             dataset_id=ga4_dataset_id,
-            credentials_path=gcp_credentials_path
+            credentials_path=gcp_credentials_path,
+            dedupe=dedupe,
+            job_limiter=self.bq_limiter
         )
         
         # Initialize loader
@@ -65,13 +138,39 @@ class Pipeline:
             region=aws_region,
             aws_profile=aws_profile,
             use_localstack=self.use_localstack,
-            localstack_endpoint=self.localstack_endpoint
+            localstack_endpoint=self.localstack_endpoint,
+            exists_cache_ttl=exists_cache_ttl,
+            max_pool_connections=s3_max_pool_connections,
+            multipart_chunksize_mb=multipart_chunksize_mb,
+            multipart_concurrency=multipart_concurrency,
+            compression=compression,
+            put_limiter=self.s3_limiter,
+            hash_partitions=hash_partitions
         )
         
         self.gcp_project_id = gcp_project_id
         self.ga4_dataset_id = ga4_dataset_id
         self.s3_bucket = s3_bucket
         self.s3_prefix = s3_prefix
+        self.gcs_staging_uri = gcs_staging_uri
+        self.export_threshold_rows = export_threshold_rows
+        self.legacy = legacy
+        self.retry_attempts = retry_attempts
+    
+    def __enter__(self) -> "Pipeline":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """
+        Release BigQuery client connections
+        
+        The S3 client is shared by every loader with the same settings and
+        is left open for them.
+        """
+        self.extractor.close()
     
     def run_daily(
         self, 
@@ -92,55 +191,216 @@ class Pipeline:
         if date is None:
             date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
-        logger.info(f"Starting pipeline for date: {date}")
+        if skip_existing:
+            skipped = self._skip_result(date)
+            if skipped is not None:
+                return skipped
+        
+        return self._run_daily_unchecked(date)
+    
+    def run_daily_export(
+        self, 
+        date: Optional[str] = None, 
+        skip_existing: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run daily pipeline through a BigQuery export to GCS
+        
+        BigQuery writes parquet to the GCS staging prefix server-side and
+        the files are copied to S3 as-is, so rows are never decoded here.
         
-        result = {
+        Args:
+            date: Date in YYYY-MM-DD format (defaults to yesterday)
+            skip_existing: Skip if data already exists in S3
+            
+        Returns:
+            Dictionary with pipeline results
+        """
+        if self.gcs_staging_uri is None:
+            raise ValueError("gcs_staging_uri is required for export runs")
+        
+        # Default to yesterday if no date provided
+        if date is None:
+            date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        
+        if skip_existing:
+            skipped = self._skip_result(date)
+            if skipped is not None:
+                return skipped
+        
+        return self._run_export_unchecked(date)
+    
+    def _skip_result(self, date: str) -> Optional[Dict[str, Any]]:
+        """Result for a date that should not be run, or None to proceed"""
+        try:
+            exists = self.loader.check_exists(date)
+        except Exception as e:
+            logger.error("Pipeline failed for %s: %s", date, e)
+            result = self._new_result(date)
+            result['error'] = str(e)
+            return result
+        
+        if exists:
+            logger.info("Data already exists for %s, skipping", date)
+            result = self._new_result(date)
+            result['skipped'] = True
+            result['skip_reason'] = 'exists'
+            result['success'] = True
+            return result
+        
+        return None
+    
+    def _use_export(self, date: str) -> bool:
+        """Whether a date is large enough to go through the GCS export path"""
+        if self.gcs_staging_uri is None or self.export_threshold_rows is None:
+            return False
+        
+        try:
+            return self.extractor.estimate_row_count(date) >= self.export_threshold_rows
+        except Exception as e:
+            logger.warning("Could not estimate row count for %s, streaming instead: %s", date, e)
+            return False
+    
+    def _new_result(self, date: str) -> Dict[str, Any]:
+        """Empty result dictionary for a daily run"""
+        return {
             'date': date,
             'success': False,
             'records_extracted': 0,
             's3_key': None,
             'error': None,
-            'skipped': False
+            'skipped': False,
+            'skip_reason': None,
+            'retries': 0
         }
+    
+    def _run_daily_unchecked(self, date: str) -> Dict[str, Any]:
+        """Extract and load one date without checking whether it already exists"""
+        if self._use_export(date):
+            return self._run_export_unchecked(date)
+        
+        logger.info("Starting pipeline for date: %s", date)
+        
+        result = self._new_result(date)
         
         try:
-            # Check if data already exists
-            if skip_existing and self.loader.check_exists(date):
-                logger.info(f"Data already exists for {date}, skipping")
-                result['skipped'] = True
-                result['success'] = True
+            logger.info("Extracting GA4 events for %s", date)
+            
+            load = self._load_dataframe if self.legacy else self.stream_to_s3
+            
+            # Count retries as they happen so days that still fail report them too
+            def on_retry(error: Exception):
+                result['retries'] += 1
+                self._on_retry(error)
+            
+            # Retry the whole day: a stream cannot resume halfway through
+            upload, _ = retry_call(
+                functools.partial(load, date), attempts=self.retry_attempts, on_retry=on_retry
+            )
+            
+            if upload['s3_key'] is None:
+                logger.warning("No data found for %s", date)
+                result['error'] = 'No data found'
                 return result
             
-            # Extract data from BigQuery
-            logger.info(f"Extracting GA4 events for {date}")
-            df = self.extractor.extract_events(date)
+            result['records_extracted'] = upload['record_count']
+            result['s3_key'] = upload['s3_key']
+            
+            result['success'] = True
+            if upload['unchanged']:
+                result['skipped'] = True
+                result['skip_reason'] = 'unchanged'
+                logger.info("Data for %s is unchanged in S3, upload skipped", date)
+            else:
+                logger.info("Pipeline completed successfully for %s: loaded %s records to S3",
+                            date, upload['record_count'])
+            
+        except Exception as e:
+            logger.error("Pipeline failed for %s: %s", date, e)
+            result['error'] = str(e)
+        
+        return result
+    
+    def _on_retry(self, error: Exception):
+        """Slow the matching limiter down when a retry was caused by throttling"""
+        backend = throttled_by(error)
+        if backend == 'bigquery':
+            self.bq_limiter.throttle()
+        elif backend == 's3':
+            self.s3_limiter.throttle()
+    
+    def _load_dataframe(self, date: str) -> Dict[str, Any]:
+        """Load one date through a full DataFrame; returns the upload result"""
+        df = self.extractor.extract_events(date)
+        return self.loader.upload_events(df, date, return_result=True)
+    
+    def _run_export_unchecked(self, date: str) -> Dict[str, Any]:
+        """Export one date to GCS and copy the files to S3"""
+        logger.info("Starting export pipeline for date: %s", date)
+        
+        result = self._new_result(date)
+        
+        try:
+            blobs = self.extractor.export_events(date, self.gcs_staging_uri)
             
-            if df.empty:
-                logger.warning(f"No data found for {date}")
+            if not blobs:
+                logger.warning("No data found for %s", date)
                 result['error'] = 'No data found'
                 return result
             
-            result['records_extracted'] = len(df)
+            copied = self.loader.copy_parquet_files(
+                [functools.partial(blob.open, 'rb') for blob in blobs],
+                date
+            )
             
-            # Load to S3
-            logger.info(f"Loading {len(df)} records to S3")
-            s3_key = self.loader.upload_events(df, date)
-            result['s3_key'] = s3_key
+            result['records_extracted'] = copied['record_count']
+            result['s3_key'] = copied['s3_key']
             
             result['success'] = True
-            logger.info(f"Pipeline completed successfully for {date}")
+            logger.info("Export pipeline completed successfully for %s", date)
             
         except Exception as e:
-            logger.error(f"Pipeline failed for {date}: {str(e)}")
+            logger.error("Pipeline failed for %s: %s", date, e)
             result['error'] = str(e)
         
         return result
     
+    def stream_to_s3(self, date: str, data_type: str = "events") -> Dict[str, Any]:
+        """
+        Stream a day of events from BigQuery straight into S3
+        
+        Record batches flow from the extractor into the parquet writer
+        without ever building a DataFrame.
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            data_type: Type of data (e.g., 'events')
+            
+        Returns:
+            Dictionary with the S3 key (None if no rows), record count and
+            whether the upload was skipped as unchanged
+        """
+        logger.info("Streaming GA4 events for %s to S3", date)
+        
+        batches = self.extractor.extract_events_arrow(date)
+        
+        # Peek at the first batch so empty days never start an upload
+        first_batch = next(batches, None)
+        
+        if first_batch is None:
+            return {'s3_key': None, 'record_count': 0, 'unchanged': False}
+        
+        # Rows are counted as the batches are written
+        return self.loader.upload_batches(
+            itertools.chain([first_batch], batches), date, data_type=data_type
+        )
+    
     def backfill(
         self, 
         start_date: str, 
         end_date: str, 
-        skip_existing: bool = True
+        skip_existing: bool = True,
+        max_workers: int = 8
     ) -> Dict[str, Any]:
         """
         Backfill data for a date range
@@ -149,16 +409,180 @@ class Pipeline:
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format  
             skip_existing: Skip dates that already exist in S3
+            max_workers: Number of dates processed concurrently
+            
+        Returns:
+            Dictionary with backfill results
+        """
+        results, pending_dates, max_workers = self._prepare_backfill(
+            start_date, end_date, skip_existing, max_workers
+        )
+        
+        # Extract and load run concurrently; both sides are I/O-bound
+        workers = max(1, min(max_workers, len(pending_dates)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._run_daily_unchecked, date_str): date_str
+                for date_str in pending_dates
+            }
+            
+            for future in as_completed(futures):
+                date_str = futures[future]
+                
+                try:
+                    day_result = future.result()
+                except Exception as e:
+                    logger.error("Unexpected error processing %s: %s", date_str, e)
+                    day_result = self._new_result(date_str)
+                    day_result['error'] = str(e)
+                
+                self._record_day(results, day_result)
+        
+        return self._finish_backfill(results)
+    
+    def backfill_batched(
+        self, 
+        start_date: str, 
+        end_date: str, 
+        skip_existing: bool = True,
+        group_by: str = "month",
+        max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Backfill a date range with one BigQuery query per group of days
+        
+        Each run of consecutive missing dates within a group is extracted
+        with a single events_* query, then split back into the usual
+        per-day S3 objects as the rows stream in. Transient failures retry
+        the run from the first unfinished day, and days above
+        export_threshold_rows go through the GCS export path instead.
+        
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format  
+            skip_existing: Skip dates that already exist in S3
+            group_by: Query granularity, 'month' or 'day'
+            max_workers: Number of groups processed concurrently
+            
+        Returns:
+            Dictionary with backfill results
+        """
+        if group_by not in BACKFILL_GROUPS:
+            raise ValueError(f"group_by must be one of {BACKFILL_GROUPS}")
+        
+        results, pending_dates, max_workers = self._prepare_backfill(
+            start_date, end_date, skip_existing, max_workers
+        )
+        
+        groups = self._group_dates(pending_dates, group_by)
+        
+        workers = max(1, min(max_workers, len(groups)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._run_range_unchecked, group): group
+                for group in groups
+            }
+            
+            for future in as_completed(futures):
+                group = futures[future]
+                
+                try:
+                    day_results = future.result()
+                except Exception as e:
+                    logger.error("Unexpected error processing %s to %s: %s", group[0], group[-1], e)
+                    day_results = {}
+                    for date_str in group:
+                        day_results[date_str] = self._new_result(date_str)
+                        day_results[date_str]['error'] = str(e)
+                
+                for day_result in day_results.values():
+                    self._record_day(results, day_result)
+        
+        return self._finish_backfill(results)
+    
+    async def run_daily_async(
+        self, 
+        date: Optional[str] = None, 
+        skip_existing: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run the daily pipeline without blocking the event loop
+        
+        Args:
+            date: Date in YYYY-MM-DD format (defaults to yesterday)
+            skip_existing: Skip if data already exists in S3
+            
+        Returns:
+            Dictionary with pipeline results
+        """
+        return await asyncio.to_thread(self.run_daily, date, skip_existing)
+    
+    async def backfill_async(
+        self, 
+        start_date: str, 
+        end_date: str, 
+        skip_existing: bool = True,
+        max_concurrent: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Backfill data for a date range from an asyncio event loop
+        
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format  
+            skip_existing: Skip dates that already exist in S3
+            max_concurrent: Number of dates in flight at once
             
         Returns:
             Dictionary with backfill results
         """
+        results, pending_dates, max_concurrent = await asyncio.to_thread(
+            self._prepare_backfill, start_date, end_date, skip_existing, max_concurrent
+        )
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def run_date(date_str: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self._run_daily_unchecked, date_str)
+        
+        day_results = await asyncio.gather(
+            *(run_date(date_str) for date_str in pending_dates),
+            return_exceptions=True
+        )
+        
+        for date_str, day_result in zip(pending_dates, day_results):
+            if isinstance(day_result, Exception):
+                logger.error("Unexpected error processing %s: %s", date_str, day_result)
+                error = str(day_result)
+                day_result = self._new_result(date_str)
+                day_result['error'] = error
+            
+            self._record_day(results, day_result)
+        
+        return self._finish_backfill(results)
+    
+    def _prepare_backfill(
+        self, 
+        start_date: str, 
+        end_date: str, 
+        skip_existing: bool,
+        max_workers: int
+    ) -> Tuple[Dict[str, Any], List[str], int]:
+        """Validate backfill arguments and work out which dates still need loading"""
         start = datetime.strptime(start_date, '%Y-%m-%d')
         end = datetime.strptime(end_date, '%Y-%m-%d')
         
         if start > end:
             raise ValueError("start_date must be before end_date")
         
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        
+        if max_workers > MAX_BACKFILL_WORKERS:
+            logger.warning("Capping backfill workers at %s (requested %s)", MAX_BACKFILL_WORKERS, max_workers)
+            max_workers = MAX_BACKFILL_WORKERS
+        
         results = {
             'start_date': start_date,
             'end_date': end_date,
@@ -166,45 +590,159 @@ class Pipeline:
             'successful_days': [],
             'failed_days': [],
             'skipped_days': [],
-            'total_records': 0
+            'total_records': 0,
+            's3_keys': {}
         }
         
-        logger.info(f"Starting backfill from {start_date} to {end_date}")
+        logger.info("Starting backfill from %s to %s", start_date, end_date)
         
-        current_date = start
-        while current_date <= end:
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            try:
-                day_result = self.run_daily(date_str, skip_existing=skip_existing)
-                
-                if day_result['success']:
-                    if day_result['skipped']:
-                        results['skipped_days'].append(date_str)
-                    else:
-                        results['successful_days'].append(date_str)
-                        results['total_records'] += day_result['records_extracted']
-                else:
-                    results['failed_days'].append({
-                        'date': date_str,
-                        'error': day_result['error']
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error processing {date_str}: {str(e)}")
-                results['failed_days'].append({
-                    'date': date_str,
-                    'error': str(e)
-                })
+        # One listing up front instead of an existence check per date
+        existing_dates = self.loader.list_existing_dates() if skip_existing else frozenset()
+        
+        # Build every date string in one vectorized pass
+        dates = pd.date_range(start, end, freq='D').strftime('%Y-%m-%d').tolist()
+        
+        pending_dates = []
+        for date_str in dates:
+            if date_str in existing_dates:
+                logger.info("Data already exists for %s, skipping", date_str)
+                results['skipped_days'].append(date_str)
+            else:
+                pending_dates.append(date_str)
+        
+        return results, pending_dates, max_workers
+    
+    def _record_day(self, results: Dict[str, Any], day_result: Dict[str, Any]):
+        """Fold one day's result into the backfill results"""
+        if day_result['success']:
+            if day_result['skipped']:
+                # Unchanged days were already in S3; their rows aren't new
+                results['skipped_days'].append(day_result['date'])
+            else:
+                results['successful_days'].append(day_result['date'])
+                results['total_records'] += day_result['records_extracted']
             
-            current_date += timedelta(days=1)
+            if day_result['s3_key'] is not None:
+                results['s3_keys'][day_result['date']] = day_result['s3_key']
+        else:
+            results['failed_days'].append({
+                'date': day_result['date'],
+                'error': day_result['error']
+            })
+    
+    def _finish_backfill(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Order backfill results and log the summary"""
+        # Days finish out of order; report them chronologically
+        results['successful_days'].sort()
+        results['skipped_days'].sort()
+        results['failed_days'].sort(key=lambda failure: failure['date'])
         
-        logger.info(f"Backfill completed. Success: {len(results['successful_days'])}, "
-                   f"Failed: {len(results['failed_days'])}, "
-                   f"Skipped: {len(results['skipped_days'])}")
+        logger.info("Backfill completed. Success: %d, Failed: %d, Skipped: %d",
+                    len(results['successful_days']),
+                    len(results['failed_days']),
+                    len(results['skipped_days']))
         
         return results
     
+    def _group_dates(self, dates: List[str], group_by: str) -> List[List[str]]:
+        """Split sorted dates into runs of consecutive days within one group"""
+        if group_by == "day":
+            return [[date_str] for date_str in dates]
+        
+        dates = pd.Series(dates, dtype=object)
+        days = pd.to_datetime(dates, format='%Y-%m-%d')
+        months = days.dt.to_period('M')
+        
+        # A new run starts after a gap (e.g. a skipped date) or at a month boundary
+        new_run = days.diff().ne(pd.Timedelta(days=1)) | months.ne(months.shift())
+        
+        return [group.tolist() for _, group in dates.groupby(new_run.cumsum())]
+    
+    def _run_range_unchecked(self, dates: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract consecutive dates with one query and load each day separately
+        
+        Days large enough for the GCS export path are exported on their own;
+        the remaining runs of consecutive days share one range query each.
+        """
+        day_results = {}
+        range_dates = []
+        
+        for date_str in dates:
+            if self._use_export(date_str):
+                day_results[date_str] = self._run_export_unchecked(date_str)
+            else:
+                range_dates.append(date_str)
+        
+        for run in self._group_dates(range_dates, "month"):
+            day_results.update(self._run_range_with_retry(run))
+        
+        return day_results
+    
+    def _run_range_with_retry(self, dates: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Load a run of consecutive dates, resuming after the last finished day on retry"""
+        logger.info("Starting pipeline for dates: %s to %s", dates[0], dates[-1])
+        
+        day_results = {date_str: self._new_result(date_str) for date_str in dates}
+        progress = {'through': None}
+        
+        def on_retry(error: Exception):
+            for day_result in day_results.values():
+                if not day_result['success']:
+                    day_result['retries'] += 1
+            self._on_retry(error)
+        
+        try:
+            retry_call(
+                functools.partial(self._load_range, dates, day_results, progress),
+                attempts=self.retry_attempts,
+                on_retry=on_retry
+            )
+            
+        except Exception as e:
+            logger.error("Pipeline failed for %s to %s: %s", dates[0], dates[-1], e)
+            for day_result in day_results.values():
+                if not day_result['success']:
+                    day_result['error'] = str(e)
+        
+        for date_str, day_result in day_results.items():
+            if not day_result['success'] and day_result['error'] is None:
+                logger.warning("No data found for %s", date_str)
+                day_result['error'] = 'No data found'
+        
+        return day_results
+    
+    def _load_range(
+        self,
+        dates: List[str],
+        day_results: Dict[str, Dict[str, Any]],
+        progress: Dict[str, Optional[str]]
+    ):
+        """Stream the dates after progress['through'] with one query, filling day_results"""
+        # Days up to the last finished upload are done, including empty ones
+        pending = [date_str for date_str in dates if progress['through'] is None or date_str > progress['through']]
+        if not pending:
+            return
+        
+        pieces = self.extractor.extract_events_range(pending[0], pending[-1])
+        
+        for date_str, day_pieces in itertools.groupby(pieces, key=lambda piece: piece[0]):
+            if date_str not in day_results:
+                continue
+            
+            upload = self.loader.upload_batches((batch for _, batch in day_pieces), date_str)
+            
+            if upload['s3_key'] is not None:
+                day_result = day_results[date_str]
+                day_result['records_extracted'] = upload['record_count']
+                day_result['s3_key'] = upload['s3_key']
+                day_result['success'] = True
+                if upload['unchanged']:
+                    day_result['skipped'] = True
+                    day_result['skip_reason'] = 'unchanged'
+            
+            progress['through'] = date_str
+    
     def test_connections(self) -> Dict[str, bool]:
         """Test all pipeline connections"""
         logger.info("Testing pipeline connections...")
@@ -218,40 +756,97 @@ class Pipeline:
         try:
             results['bigquery'] = self.extractor.test_connection()
         except Exception as e:
-            logger.error(f"BigQuery connection test failed: {str(e)}")
+            logger.error("BigQuery connection test failed: %s", e)
         
         # Test S3
         try:
             results['s3'] = self.loader.test_connection()
         except Exception as e:
-            logger.error(f"S3 connection test failed: {str(e)}")
+            logger.error("S3 connection test failed: %s", e)
+        
+        self._log_connection_results(results)
+        
+        return results
+    
+    def _log_connection_results(self, results: Dict[str, bool]):
+        """Log connection test results; the dict repr is only built when INFO is on"""
+        if logger.isEnabledFor(logging.INFO):
+            all_good = all(results.values())
+            logger.info("Connection test results: %s - All systems: %s", results, '✅' if all_good else '❌')
+    
+    async def test_connections_async(self) -> Dict[str, bool]:
+        """Test BigQuery and S3 connections concurrently"""
+        logger.info("Testing pipeline connections...")
+        
+        bigquery_ok, s3_ok = await asyncio.gather(
+            asyncio.to_thread(self.extractor.test_connection),
+            asyncio.to_thread(self.loader.test_connection),
+            return_exceptions=True
+        )
+        
+        results = {
+            'bigquery': bigquery_ok is True,
+            's3': s3_ok is True
+        }
+        
+        if isinstance(bigquery_ok, Exception):
+            logger.error("BigQuery connection test failed: %s", bigquery_ok)
+        if isinstance(s3_ok, Exception):
+            logger.error("S3 connection test failed: %s", s3_ok)
         
-        all_good = all(results.values())
-        logger.info(f"Connection test results: {results} - All systems: {'✅' if all_good else '❌'}")
+        self._log_connection_results(results)
         
         return results
     
     def get_pipeline_status(self) -> Dict[str, Any]:
-        """Get pipeline status and available data"""
+        """Get pipeline status and available data
+        
+        The connection tests and both date listings are independent, so all
+        four probes run concurrently and a failure in one is logged without
+        hiding the others.
+        """
         status = {
-            'connections': self.test_connections(),
+            'connections': {'bigquery': False, 's3': False},
             'bigquery_available_dates': [],
             's3_available_dates': [],
             'missing_dates': []
         }
         
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                'bigquery': executor.submit(self.extractor.test_connection),
+                's3': executor.submit(self.loader.test_connection),
+                'bigquery_dates': executor.submit(self.extractor.get_available_dates, days_back=30),
+                's3_dates': executor.submit(self.loader.list_available_dates, limit=30)
+            }
+        
+        # Test connections
+        for name, label in (('bigquery', 'BigQuery'), ('s3', 'S3')):
+            try:
+                status['connections'][name] = futures[name].result()
+            except Exception as e:
+                logger.error("%s connection test failed: %s", label, e)
+        
+        self._log_connection_results(status['connections'])
+        
+        # Get available dates from both sources
         try:
-            # Get available dates from both sources
-            bq_dates = self.extractor.get_available_dates(days_back=30)
-            s3_dates = self.loader.list_available_dates(limit=30)
-            
-            status['bigquery_available_dates'] = bq_dates
-            status['s3_available_dates'] = s3_dates
-            
-            # Find dates in BigQuery but not in S3
-            status['missing_dates'] = [date for date in bq_dates if date not in s3_dates]
-            
+            # Newest first, matching the S3 listing, so output is deterministic
+            status['bigquery_available_dates'] = sorted(futures['bigquery_dates'].result(), reverse=True)
         except Exception as e:
-            logger.error(f"Error getting pipeline status: {str(e)}")
+            logger.error("Error getting BigQuery available dates: %s", e)
+        
+        try:
+            status['s3_available_dates'] = futures['s3_dates'].result()
+        except Exception as e:
+            logger.error("Error getting S3 available dates: %s", e)
+        
+        if futures['bigquery_dates'].exception() is None and futures['s3_dates'].exception() is None:
+            # Find dates in BigQuery but not in S3 (set lookup keeps this linear)
+            s3_dates = set(status['s3_available_dates'])
+            status['missing_dates'] = [
+                date for date in status['bigquery_available_dates']
+                if date not in s3_dates
+            ]
         
         return status
\ No newline at end of file
@@ -0,0 +1,87 @@
+# src/pipeline/utils/rate_limit.py
+"""
+Thread-safe token bucket for pacing requests to BigQuery and S3.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds for a throttled bucket to climb back to its configured rate
+RECOVERY_SECONDS = 60.0
+
+# Refill rounding can leave a bucket a hair short of a whole token
+_TOKEN_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """Token bucket rate limiter shared by concurrent workers"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        name: str = "bucket"
+    ):
+        """
+        Initialize the token bucket
+
+        Args:
+            rate: Sustained requests per second
+            capacity: Largest burst allowed (defaults to one second of rate)
+            min_rate: Floor for throttle() halving (defaults to rate / 64)
+            name: Label used in log messages
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.max_rate)
+        self.min_rate = float(min_rate) if min_rate else self.max_rate / 64
+        self.name = name
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add tokens for the time elapsed; caller holds the lock"""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+        # After a throttle, regain the configured rate linearly
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * elapsed / RECOVERY_SECONDS)
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until tokens are available, then consume them"""
+        # A request larger than the bucket would never fit
+        tokens = min(tokens, self.capacity)
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens - _TOKEN_EPSILON:
+                    self._tokens = max(0.0, self._tokens - tokens)
+                    return
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def throttle(self):
+        """Halve the rate after the backend signalled throttling"""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            rate = self.rate
+
+        logger.warning(f"Throttled by {self.name}, slowing to {rate:.1f} requests/s")
@@ -0,0 +1,102 @@
+# src/pipeline/utils/retry.py
+"""
+Retry with exponential backoff for transient BigQuery and S3 failures.
+"""
+
+import logging
+import random
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError
+from google.api_core import exceptions as gcp_exceptions
+
+
+logger = logging.getLogger(__name__)
+
+# BigQuery errors worth another attempt (503, 429, 500)
+RETRYABLE_GCP_ERRORS = (
+    gcp_exceptions.ServiceUnavailable,
+    gcp_exceptions.TooManyRequests,
+    gcp_exceptions.InternalServerError,
+)
+
+# S3 error codes that signal throttling
+THROTTLE_S3_CODES = frozenset({
+    'SlowDown',
+    'Throttling',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+})
+
+# S3 error codes for other transient server-side failures
+RETRYABLE_S3_CODES = THROTTLE_S3_CODES | {
+    'ServiceUnavailable',
+    'InternalError',
+    'RequestTimeout',
+    '500',
+    '503',
+}
+
+
+def throttled_by(error: Exception) -> Optional[str]:
+    """Backend ('bigquery' or 's3') asking us to slow down, or None"""
+    if isinstance(error, gcp_exceptions.TooManyRequests):
+        return 'bigquery'
+    if isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in THROTTLE_S3_CODES:
+        return 's3'
+    return None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether an exception is a transient failure that is safe to retry"""
+    if isinstance(error, (RETRYABLE_GCP_ERRORS, BotoConnectionError)):
+        return True
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') in RETRYABLE_S3_CODES
+    return False
+
+
+def backoff_delay(attempt: int, initial: float = 1.0, maximum: float = 30.0) -> float:
+    """Exponential delay for a zero-based retry attempt, plus up to a second of jitter"""
+    return min(maximum, initial * 2 ** attempt + random.uniform(0, 1))
+
+
+def retry_call(
+    func: Callable[[], Any],
+    attempts: int = 5,
+    initial: float = 1.0,
+    maximum: float = 30.0,
+    on_retry: Optional[Callable[[Exception], None]] = None
+) -> Tuple[Any, int]:
+    """
+    Call func, retrying transient errors with exponential backoff and jitter
+
+    Args:
+        func: Zero-argument callable to run
+        attempts: Maximum number of calls, including the first
+        initial: Base delay in seconds before the first retry
+        maximum: Upper bound on any single delay in seconds
+        on_retry: Optional callback invoked with each retried exception
+
+    Returns:
+        Tuple of (func's return value, number of retries used)
+    """
+    retries = 0
+
+    while True:
+        try:
+            return func(), retries
+        except Exception as e:
+            if retries + 1 >= attempts or not is_transient_error(e):
+                raise
+
+            delay = backoff_delay(retries, initial, maximum)
+            retries += 1
+            logger.warning(f"Transient error ({str(e)}), retry {retries}/{attempts - 1} in {delay:.1f}s")
+
+            if on_retry is not None:
+                on_retry(e)
+
+            time.sleep(delay)
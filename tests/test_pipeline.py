@@ -0,0 +1,118 @@
+"""Tests for pipeline orchestration"""
+
+from unittest import mock
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from google.api_core import exceptions as gcp_exceptions
+
+from pipeline.pipeline import Pipeline
+from pipeline.utils import retry
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(retry.time, 'sleep', lambda seconds: None)
+
+
+@pytest.fixture
+def pipeline():
+    """Pipeline with mocked extractor and loader, skipping client setup"""
+    instance = Pipeline.__new__(Pipeline)
+    instance.extractor = mock.Mock()
+    instance.loader = mock.Mock()
+    instance.bq_limiter = mock.Mock()
+    instance.s3_limiter = mock.Mock()
+    instance.gcs_staging_uri = None
+    instance.export_threshold_rows = None
+    instance.legacy = False
+    instance.retry_attempts = 5
+    return instance
+
+
+def batch(rows: int = 3) -> pa.RecordBatch:
+    return pa.record_batch({'event_timestamp': pa.array(range(rows), pa.int64())})
+
+
+def upload_result(batches, date_str):
+    return {
+        's3_key': f"events/{date_str}/data.parquet",
+        'record_count': sum(b.num_rows for b in batches),
+        'unchanged': False
+    }
+
+
+def test_batched_backfill_resumes_after_last_finished_day(pipeline):
+    calls = []
+
+    def extract_events_range(start, end):
+        calls.append((start, end))
+        if start == "2024-01-01":
+            yield "2024-01-01", batch()
+        # Fail partway through the second day on the first attempt
+        yield "2024-01-02", batch()
+        if len(calls) == 1:
+            raise gcp_exceptions.ServiceUnavailable('down')
+        yield "2024-01-03", batch()
+
+    pipeline.extractor.extract_events_range.side_effect = extract_events_range
+    pipeline.loader.list_existing_dates.return_value = frozenset()
+    pipeline.loader.upload_batches.side_effect = lambda batches, date_str: upload_result(list(batches), date_str)
+
+    results = pipeline.backfill_batched("2024-01-01", "2024-01-03")
+
+    assert calls == [("2024-01-01", "2024-01-03"), ("2024-01-02", "2024-01-03")]
+    assert results['successful_days'] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert results['failed_days'] == []
+    assert results['total_records'] == 9
+
+
+def test_batched_backfill_fails_unfinished_days_after_attempts(pipeline):
+    def extract_events_range(start, end):
+        if start == "2024-01-01":
+            yield "2024-01-01", batch()
+        yield "2024-01-02", batch()
+        raise gcp_exceptions.ServiceUnavailable('down')
+
+    pipeline.retry_attempts = 2
+    pipeline.extractor.extract_events_range.side_effect = extract_events_range
+    pipeline.loader.list_existing_dates.return_value = frozenset()
+    pipeline.loader.upload_batches.side_effect = lambda batches, date_str: upload_result(list(batches), date_str)
+
+    results = pipeline.backfill_batched("2024-01-01", "2024-01-02")
+
+    assert results['successful_days'] == ["2024-01-01"]
+    assert results['failed_days'] == [{'date': "2024-01-02", 'error': "503 down"}]
+
+
+def test_batched_backfill_exports_large_days(pipeline):
+    pipeline.gcs_staging_uri = "gs://staging/ga4"
+    pipeline.export_threshold_rows = 1000
+    pipeline.extractor.estimate_row_count.side_effect = lambda date_str: 5000 if date_str == "2024-01-02" else 10
+    pipeline.extractor.export_events.return_value = [mock.Mock()]
+    pipeline.extractor.extract_events_range.side_effect = lambda start, end: iter([(start, batch())])
+    pipeline.loader.list_existing_dates.return_value = frozenset()
+    pipeline.loader.upload_batches.side_effect = lambda batches, date_str: upload_result(list(batches), date_str)
+    pipeline.loader.copy_parquet_files.return_value = {'s3_key': "events/2024-01-02/", 'record_count': 5000}
+
+    results = pipeline.backfill_batched("2024-01-01", "2024-01-03")
+
+    pipeline.extractor.export_events.assert_called_once_with("2024-01-02", "gs://staging/ga4")
+    ranges = [c.args for c in pipeline.extractor.extract_events_range.call_args_list]
+    assert ranges == [("2024-01-01", "2024-01-01"), ("2024-01-03", "2024-01-03")]
+    assert results['successful_days'] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+
+def test_legacy_unchanged_day_is_skipped_in_backfill(pipeline):
+    pipeline.legacy = True
+    pipeline.extractor.extract_events.return_value = pd.DataFrame({'event_timestamp': [1, 2, 3]})
+    pipeline.loader.upload_events.side_effect = lambda df, date_str, return_result: {
+        's3_key': f"events/{date_str}/data.parquet", 'record_count': len(df), 'unchanged': True
+    }
+
+    results = pipeline.backfill("2024-01-01", "2024-01-02", skip_existing=False)
+
+    assert results['successful_days'] == []
+    assert results['skipped_days'] == ["2024-01-01", "2024-01-02"]
+    assert results['total_records'] == 0
@@ -0,0 +1,97 @@
+"""Tests for the token bucket rate limiter"""
+
+import pytest
+
+from pipeline.utils import rate_limit
+from pipeline.utils.rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when sleep() is called"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(rate_limit.time, 'sleep', fake.sleep)
+    return fake
+
+
+def test_burst_up_to_capacity_without_waiting(clock):
+    bucket = TokenBucket(rate=10)
+
+    for _ in range(10):
+        bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_acquire_paces_to_rate(clock):
+    bucket = TokenBucket(rate=10)
+
+    for _ in range(30):
+        bucket.acquire()
+
+    # The first 10 are the initial burst; the other 20 take 2s at 10/s
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_acquire_more_than_capacity_is_clamped(clock):
+    bucket = TokenBucket(rate=5, capacity=5)
+
+    bucket.acquire(50)
+
+    assert clock.sleeps == []
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_throttle_halves_rate_down_to_floor(clock):
+    bucket = TokenBucket(rate=100, min_rate=20)
+
+    bucket.throttle()
+    assert bucket.rate == 50
+    bucket.throttle()
+    assert bucket.rate == 25
+    bucket.throttle()
+    assert bucket.rate == 20
+
+
+def test_throttled_rate_recovers_linearly(clock):
+    bucket = TokenBucket(rate=100)
+    bucket.throttle()
+
+    # A quarter of the recovery window regains a quarter of the configured rate (50 -> 75)
+    clock.now += rate_limit.RECOVERY_SECONDS / 4
+    bucket.acquire()
+    assert bucket.rate == pytest.approx(75)
+
+    clock.now += rate_limit.RECOVERY_SECONDS
+    bucket.acquire()
+    assert bucket.rate == 100
+
+
+def test_throttled_bucket_paces_slower(clock):
+    bucket = TokenBucket(rate=10, capacity=1)
+    bucket.acquire()
+    bucket.throttle()
+
+    bucket.acquire()
+
+    # One token at ~5/s instead of 10/s
+    assert clock.sleeps[0] == pytest.approx(0.2)
@@ -0,0 +1,114 @@
+"""Tests for retry with exponential backoff"""
+
+import pytest
+from botocore.exceptions import ClientError
+from google.api_core import exceptions as gcp_exceptions
+
+from pipeline.utils import retry
+
+
+def s3_error(code: str) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'PutObject')
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Record backoff delays instead of sleeping"""
+    delays = []
+    monkeypatch.setattr(retry.time, 'sleep', delays.append)
+    return delays
+
+
+class Flaky:
+    """Callable that raises the given errors in order, then returns 'ok'"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+@pytest.mark.parametrize("error", [
+    gcp_exceptions.ServiceUnavailable('down'),
+    gcp_exceptions.TooManyRequests('slow down'),
+    gcp_exceptions.InternalServerError('oops'),
+    s3_error('SlowDown'),
+    s3_error('503'),
+    s3_error('InternalError'),
+])
+def test_transient_errors(error):
+    assert retry.is_transient_error(error)
+
+
+@pytest.mark.parametrize("error", [
+    gcp_exceptions.BadRequest('bad query'),
+    gcp_exceptions.NotFound('no table'),
+    s3_error('AccessDenied'),
+    s3_error('NoSuchBucket'),
+    ValueError('bug'),
+])
+def test_non_transient_errors(error):
+    assert not retry.is_transient_error(error)
+
+
+def test_throttled_by():
+    assert retry.throttled_by(gcp_exceptions.TooManyRequests('slow down')) == 'bigquery'
+    assert retry.throttled_by(s3_error('SlowDown')) == 's3'
+    assert retry.throttled_by(s3_error('Throttling')) == 's3'
+    assert retry.throttled_by(gcp_exceptions.ServiceUnavailable('down')) is None
+    assert retry.throttled_by(s3_error('InternalError')) is None
+    assert retry.throttled_by(ValueError('bug')) is None
+
+
+def test_returns_value_and_retry_count(no_sleep):
+    func = Flaky(s3_error('SlowDown'), gcp_exceptions.ServiceUnavailable('down'))
+
+    assert retry.retry_call(func, attempts=5) == ('ok', 2)
+    assert func.calls == 3
+    assert len(no_sleep) == 2
+
+
+def test_gives_up_after_attempts(no_sleep):
+    func = Flaky(*[gcp_exceptions.ServiceUnavailable('down')] * 10)
+    retried = []
+
+    with pytest.raises(gcp_exceptions.ServiceUnavailable):
+        retry.retry_call(func, attempts=3, on_retry=retried.append)
+
+    assert func.calls == 3
+    assert len(retried) == 2
+    assert len(no_sleep) == 2
+
+
+def test_non_transient_error_is_not_retried(no_sleep):
+    func = Flaky(s3_error('AccessDenied'))
+
+    with pytest.raises(ClientError):
+        retry.retry_call(func, attempts=5)
+
+    assert func.calls == 1
+    assert no_sleep == []
+
+
+def test_single_attempt_disables_retries():
+    func = Flaky(gcp_exceptions.ServiceUnavailable('down'))
+
+    with pytest.raises(gcp_exceptions.ServiceUnavailable):
+        retry.retry_call(func, attempts=1)
+
+    assert func.calls == 1
+
+
+def test_backoff_delay_grows_and_is_capped(monkeypatch):
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: 0.0)
+
+    assert [retry.backoff_delay(attempt) for attempt in range(6)] == [1, 2, 4, 8, 16, 30]
+
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: high)
+    assert retry.backoff_delay(0) == 2
+    assert retry.backoff_delay(10) == 30
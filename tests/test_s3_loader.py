@@ -0,0 +1,194 @@
+"""Tests for the S3 loader"""
+
+import hashlib
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from botocore.exceptions import ClientError
+
+from pipeline.loaders.s3_loader import ROW_GROUP_SIZE, S3Loader
+
+
+class FakeS3:
+    """In-memory stand-in for the S3 calls S3Loader makes"""
+
+    def __init__(self):
+        self.objects = {}
+        self.deleted = []
+
+    def get_paginator(self, operation):
+        return self
+
+    def paginate(self, Bucket, Prefix, Delimiter=None):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        if Delimiter is None:
+            yield {'Contents': [{'Key': key} for key in keys]}
+        else:
+            prefixes = sorted({Prefix + key[len(Prefix):].split(Delimiter, 1)[0] + Delimiter
+                               for key in keys if Delimiter in key[len(Prefix):]})
+            yield {'CommonPrefixes': [{'Prefix': prefix} for prefix in prefixes]}
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys=1000):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))[:MaxKeys]
+        return {'KeyCount': len(keys), 'Contents': [{'Key': key} for key in keys]}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+        return {'Metadata': self.objects[Key]['Metadata']}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        self.objects[key] = {'Body': fileobj.read(), 'Metadata': (ExtraArgs or {}).get('Metadata', {})}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = {'Body': Body, 'Metadata': {}}
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete['Objects']:
+            self.deleted.append(obj['Key'])
+            self.objects.pop(obj['Key'], None)
+
+
+@pytest.fixture
+def s3():
+    return FakeS3()
+
+
+@pytest.fixture
+def loader(s3):
+    instance = S3Loader(bucket_name="bronze-test", region="us-east-1")
+    instance.s3_client = s3
+    return instance
+
+
+def parquet_source(table):
+    def open_source():
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        buffer.seek(0)
+        return buffer
+    return open_source
+
+
+def partition_files(s3, loader, date):
+    partition_dir = loader._partition_dir(date, "events")
+    return sorted(key.rsplit('/', 1)[1] for key in s3.objects if key.startswith(partition_dir))
+
+
+@pytest.fixture
+def events():
+    rows = 2 * ROW_GROUP_SIZE + 88_000
+    return pa.table({
+        'event_timestamp': pa.array(range(rows), pa.int64()),
+        'event_name': pa.array([f"event_{i % 7}" for i in range(rows)])
+    })
+
+
+@pytest.mark.parametrize("batch_size", [70_000, 100_000, 600_000])
+def test_upload_batches_writes_full_row_groups_independent_of_batching(loader, events, batch_size, monkeypatch):
+    written = {}
+
+    def capture(parquet_file, s3_key, date, data_type):
+        parquet_file.seek(0)
+        written['bytes'] = parquet_file.read()
+        return False
+
+    monkeypatch.setattr(loader, '_upload_parquet', capture)
+
+    result = loader.upload_batches(events.to_batches(max_chunksize=batch_size), "2024-01-15")
+
+    assert result['record_count'] == events.num_rows
+    assert result['unchanged']
+
+    metadata = pq.ParquetFile(io.BytesIO(written['bytes'])).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [256_000, 256_000, 88_000]
+
+    # Same rows must encode to the same bytes, whatever the batch boundaries
+    reference = io.BytesIO()
+    pq.write_table(events, reference, row_group_size=ROW_GROUP_SIZE, **loader.parquet_options)
+    assert hashlib.sha256(written['bytes']).digest() == hashlib.sha256(reference.getvalue()).digest()
+
+
+def test_reexport_into_fewer_files_removes_stale_files(loader, s3):
+    table = pa.table({'event_timestamp': [1, 2, 3]})
+
+    loader.copy_parquet_files([parquet_source(table)] * 3, "2024-01-15")
+    loader.copy_parquet_files([parquet_source(table)], "2024-01-15")
+
+    assert partition_files(s3, loader, "2024-01-15") == ["data-00000.parquet", "metadata.json"]
+
+
+def test_upload_after_export_removes_export_files(loader, s3):
+    table = pa.table({'event_timestamp': [1, 2, 3]})
+
+    loader.copy_parquet_files([parquet_source(table)] * 2, "2024-01-15")
+    loader.upload_events(table, "2024-01-15")
+
+    assert partition_files(s3, loader, "2024-01-15") == ["data.parquet", "metadata.json"]
+
+
+def test_expired_listing_does_not_skip_stale_cleanup(loader, s3):
+    table = pa.table({'event_timestamp': [1, 2, 3]})
+    loader.exists_cache_ttl = 0
+
+    # Listed while empty, then another run exports the day
+    assert loader.list_existing_dates() == frozenset()
+    other = S3Loader(bucket_name="bronze-test", region="us-east-1")
+    other.s3_client = s3
+    other.copy_parquet_files([parquet_source(table)] * 2, "2024-01-15")
+
+    loader.upload_events(table, "2024-01-15")
+
+    assert partition_files(s3, loader, "2024-01-15") == ["data.parquet", "metadata.json"]
+
+
+def test_fresh_listing_without_the_date_skips_cleanup(loader, s3, monkeypatch):
+    table = pa.table({'event_timestamp': [1, 2, 3]})
+    loader.list_existing_dates()
+
+    monkeypatch.setattr(loader, '_remove_stale_files', pytest.fail)
+    loader.upload_events(table, "2024-01-15")
+
+    assert partition_files(s3, loader, "2024-01-15") == ["data.parquet", "metadata.json"]
+
+
+def test_unchanged_upload_is_skipped_and_cleans_up(loader, s3):
+    table = pa.table({'event_timestamp': [1, 2, 3]})
+
+    first = loader.upload_batches(table.to_batches(), "2024-01-15")
+    stale_key = f"{loader._partition_dir('2024-01-15', 'events')}/data-00000.parquet"
+    s3.objects[stale_key] = {'Body': b'', 'Metadata': {}}
+    second = loader.upload_batches(table.to_batches(), "2024-01-15")
+
+    assert not first['unchanged']
+    assert second['unchanged']
+    assert s3.deleted == [stale_key]
+
+
+def test_upload_events_reports_unchanged(loader, s3):
+    df = pd.DataFrame({'event_timestamp': [1, 2, 3]})
+
+    assert loader.upload_events(df, "2024-01-15") == f"{loader._partition_dir('2024-01-15', 'events')}/data.parquet"
+    result = loader.upload_events(df, "2024-01-15", return_result=True)
+
+    assert result['unchanged']
+    assert result['record_count'] == 3
+
+
+def test_hash_partitions_only_accepts_fixed_bucket_space():
+    with pytest.raises(ValueError):
+        S3Loader(bucket_name="bronze-test", hash_partitions=16)
+
+
+def test_hash_partitioned_keys_are_stable_and_listed(loader, s3):
+    loader.hash_partitions = 256
+    table = pa.table({'event_timestamp': [1, 2, 3]})
+
+    for date in ("2024-01-15", "2024-01-16", "2024-02-01"):
+        loader.upload_events(table, date)
+
+    assert loader._partition_dir("2024-01-15", "events") == "bronze/ga4/bucket=04/events/year=2024/month=01/day=15"
+    assert loader.list_existing_dates() == {"2024-01-15", "2024-01-16", "2024-02-01"}